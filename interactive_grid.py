@@ -2,8 +2,8 @@
 
 from typing import Tuple
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import numpy as np
-from libs.common import normalize_to_unit_interval, scale_to_custom_interval
 
 
 X_RANGE = (-4, 5)
@@ -12,9 +12,10 @@ COUNT_RANGE = (0, 150)
 
 LINEWIDTH = 0.5
 LINESTYLE = "solid"
-MARKER = ""
 COLOR = "k"
 
+_RNG = np.random.default_rng()
+
 
 def _grid_size(x_range: Tuple[int, int], y_range: Tuple[int, int]) -> Tuple[int, int]:
     grid_width = x_range[1] - x_range[0]
@@ -23,64 +24,67 @@ def _grid_size(x_range: Tuple[int, int], y_range: Tuple[int, int]) -> Tuple[int,
 
 
 def _construct_grid_cells():
-    cells_tx, cells_ty = np.meshgrid(np.arange(*X_RANGE), np.arange(*Y_RANGE))
+    # float32 cell coordinates
+    cells_tx, cells_ty = np.meshgrid(
+        np.arange(*X_RANGE, dtype=np.float32), np.arange(*Y_RANGE, dtype=np.float32)
+    )
     cells_tx = cells_tx.flatten()
     cells_ty = cells_ty.flatten()
     return cells_tx, cells_ty
 
 
-def _line_counts_per_cell(grid_width, grid_height, center, cells_tx, cells_ty):
-    distance_to_center_range = (
-        0,
-        np.sqrt(grid_width**2 + grid_height**2),
-    )
-    distance_to_center = np.sqrt(
-        (cells_tx - center[0]) ** 2 + (cells_ty - center[1]) ** 2
-    )
-    count_normalized = normalize_to_unit_interval(
-        values=distance_to_center,
-        interval=distance_to_center_range,
+# The grid does not depend on the mouse position, construct it only once.
+_GRID_WIDTH, _GRID_HEIGHT = _grid_size(X_RANGE, Y_RANGE)
+_CELLS_TX, _CELLS_TY = _construct_grid_cells()
+# Line counts are an affine map of the distance to center, from
+# [0, grid diagonal] to COUNT_RANGE.
+_COUNT_PER_DISTANCE = (COUNT_RANGE[1] - COUNT_RANGE[0]) / np.hypot(
+    _GRID_WIDTH, _GRID_HEIGHT
+)
+
+
+def _line_counts_per_cell(center):
+    # One value per cell, keep float64 so counts don't flip at integer borders.
+    distance_to_center = np.hypot(
+        _CELLS_TX - center[0], _CELLS_TY - center[1], dtype=np.float64
     )
-    counts = scale_to_custom_interval(
-        values=count_normalized, interval=COUNT_RANGE
-    ).astype(int)
+    counts = (distance_to_center * _COUNT_PER_DISTANCE + COUNT_RANGE[0]).astype(int)
     return counts
 
 
 def _construct_lines(center, counts):
-    grid_width, grid_height = _grid_size(X_RANGE, Y_RANGE)
-    cells_tx, cells_ty = _construct_grid_cells()
-    # Compute the angle of lines for each grid cell.
-    angles = np.arctan2(cells_ty - center[1], cells_tx - center[0])
+    # All lines in a cell share the same angle, so evaluate the trigonometry once
+    # per cell and only gather the results per line.
+    angles = np.arctan2(_CELLS_TY - center[1], _CELLS_TX - center[0])
+    cos_angles = np.cos(angles)
+    sin_angles = np.sin(angles)
     # Get random starting points for all the lines in all the cells.
-    start_points_x = np.random.uniform(low=0, high=1, size=counts.sum())
-    start_points_y = np.random.uniform(low=0, high=1, size=counts.sum())
-    # Set the boundaries for the grid cell. At the beginning, keep all the grid
-    # cells at the same position. Will move the end result instead.
-    cells_x_min = np.zeros(grid_width * grid_height).repeat(counts)
-    cells_x_max = np.ones(grid_width * grid_height).repeat(counts)
-    cells_y_min = np.zeros(grid_width * grid_height).repeat(counts)
-    cells_y_max = np.ones(grid_width * grid_height).repeat(counts)
-    cells_tx = cells_tx.repeat(counts)
-    cells_ty = cells_ty.repeat(counts)
-    angles = angles.repeat(counts)
+    start_points_x, start_points_y = _RNG.random(
+        size=(2, counts.sum()), dtype=np.float32
+    )
+    # Index of the grid cell each line belongs to, used to gather per-cell data.
+    cell_indices = np.repeat(np.arange(_GRID_WIDTH * _GRID_HEIGHT), counts)
+    cells_tx = _CELLS_TX[cell_indices]
+    cells_ty = _CELLS_TY[cell_indices]
+    cos_angles = cos_angles[cell_indices]
+    sin_angles = sin_angles[cell_indices]
     # Calculate the length of each line until it hits a boundary. To that end,
-    # first figure out which border each line is going to hit.
-    border_x = np.where(np.cos(angles) >= 0, cells_x_max, cells_x_min)
-    border_y = np.where(np.sin(angles) >= 0, cells_y_max, cells_y_min)
+    # first figure out which border each line is going to hit. At the beginning,
+    # keep all the grid cells at the same position, i.e. the unit square [0, 1].
+    # Will move the end result instead.
+    border_x = (cos_angles >= 0).astype(np.float32)
+    border_y = (sin_angles >= 0).astype(np.float32)
     #  We don't have to worry about division by zero when cos(angle) or
     #  sin(angle) are zero, because they can only shoot up to +inf and we are
     #  interested in min values.
-    lengths = np.stack(
-        [
-            np.abs((border_x - start_points_x) / np.cos(angles)),
-            np.abs((border_y - start_points_y) / np.sin(angles)),
-        ],
-        axis=1,
-    ).min(axis=1)
+    with np.errstate(divide="ignore"):
+        lengths = np.abs((border_x - start_points_x) / cos_angles)
+        np.minimum(
+            lengths, np.abs((border_y - start_points_y) / sin_angles), out=lengths
+        )
     # Compute the ending point of each line.
-    end_points_x = start_points_x + lengths * np.cos(angles)
-    end_points_y = start_points_y + lengths * np.sin(angles)
+    end_points_x = start_points_x + lengths * cos_angles
+    end_points_y = start_points_y + lengths * sin_angles
     # Translate lines according to the grid cell they belong to.
     start_points_x += cells_tx
     start_points_y += cells_ty
@@ -90,57 +94,64 @@ def _construct_lines(center, counts):
 
 
 def _lines_in_grid_cells(center: Tuple[int, int]):
-    grid_width, grid_height = _grid_size(X_RANGE, Y_RANGE)
-    cells_tx, cells_ty = _construct_grid_cells()
-    counts = _line_counts_per_cell(grid_width, grid_height, center, cells_tx, cells_ty)
+    center = np.asarray(center, dtype=np.float32)
+    counts = _line_counts_per_cell(center)
     start_points_x, start_points_y, end_points_x, end_points_y = _construct_lines(
         center, counts
     )
-    # Insert NaNs in between points; in order to prevent plt from drawing a line
-    # in between two points, put a pair of [nan, nan] between them:
-    # [[p1x, p1y], [p2x, p2y], [nan, nan], [p3x, p3y],...]
-    nans = np.full(counts.sum(), np.nan)
-    points = np.stack(
-        [start_points_x, start_points_y, end_points_x, end_points_y, nans, nans],
-        axis=1,
-    ).reshape((counts.sum() * 3, 2))
+    # Pack the lines as (N, 2, 2) segments, [[[p1x, p1y], [p2x, p2y]], ...], which
+    # is what LineCollection takes without any separators in between.
+    segments = np.empty((counts.sum(), 2, 2), dtype=np.float32)
+    segments[:, 0, 0] = start_points_x
+    segments[:, 0, 1] = start_points_y
+    segments[:, 1, 0] = end_points_x
+    segments[:, 1, 1] = end_points_y
+
+    return segments
 
-    return points
+
+def _on_draw(event):
+    # Full redraws (first show, resize, ...) render everything but the animated
+    # lines; cache that as the background to restore on every mouse move.
+    global background
+    background = figure.canvas.copy_from_bbox(axis.bbox)
+    axis.draw_artist(lines)
 
 
 def _on_move(event):
-    if not event.inaxes:
+    if not event.inaxes or background is None:
         return
     mouse_position = np.floor([event.xdata, event.ydata]).astype(int)
-    # axis = event.inaxes
-    axis.cla()  # how the hell can you be the most expensive? :(
-    points = _lines_in_grid_cells(center=mouse_position)
-    axis.plot(
-        points[:, 0],
-        points[:, 1],
-        linewidth=LINEWIDTH,
-        linestyle=LINESTYLE,
-        marker=MARKER,
-        color=COLOR,
-    )
-    plt.axis("equal")
-    plt.axis("off")
-    plt.tight_layout()
-    figure.canvas.draw_idle()
-
-
-figure, axis = plt.subplots(nrows=1, ncols=1, sharex=True, figsize=(10, 10))
-initial_points = _lines_in_grid_cells(center=(0, 0))
-axis.plot(
-    initial_points[:, 0],
-    initial_points[:, 1],
-    linewidth=LINEWIDTH,
-    linestyle=LINESTYLE,
-    marker=MARKER,
-    color=COLOR,
+    # The drawing only depends on the grid cell under the mouse, skip the events
+    # that don't leave the current one.
+    global mouse_cell
+    if tuple(mouse_position) == mouse_cell:
+        return
+    mouse_cell = tuple(mouse_position)
+    segments = _lines_in_grid_cells(center=mouse_position)
+    # Blit only the lines on top of the cached background instead of clearing
+    # and redrawing the whole axes (ticks, spines, layout, ...).
+    lines.set_segments(segments)
+    figure.canvas.restore_region(background)
+    axis.draw_artist(lines)
+    figure.canvas.blit(axis.bbox)
+
+
+figure, axis = plt.subplots(figsize=(10, 10))
+background = None
+mouse_cell = (0, 0)
+lines = LineCollection(
+    _lines_in_grid_cells(center=mouse_cell),
+    linewidths=LINEWIDTH,
+    linestyles=LINESTYLE,
+    colors=COLOR,
+    animated=True,
 )
+axis.add_collection(lines)
+axis.autoscale_view()
 plt.axis("equal")
 plt.axis("off")
 plt.tight_layout()
+plt.connect("draw_event", _on_draw)
 plt.connect("motion_notify_event", _on_move)
 plt.show()
@@ -1,16 +1,25 @@
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy
 
 
 def normalize_to_unit_interval(
-    values: numpy.ndarray, interval: Tuple[float, float]
+    values: numpy.ndarray,
+    interval: Tuple[float, float],
+    out: Optional[numpy.ndarray] = None,
+    validate: bool = True,
 ) -> numpy.ndarray:
-    """Return values normalized to [0, 1] according to the interval"""
+    """Return values normalized to [0, 1] according to the interval
+
+    If out is given, the result is written into it in place of a new array.
+    With validate=False the scan checking values against the interval is
+    skipped, for callers that already know the values are in range.
+    """
     if interval[0] >= interval[1]:
         raise ValueError(f"wrong interval {interval}")
-    if (interval[0] > values).any() or (values > interval[1]).any():
+    if validate and ((interval[0] > values).any() or (values > interval[1]).any()):
         raise ValueError("values out of interval")
-    return (values - interval[0]) / (interval[1] - interval[0])
+    result = numpy.subtract(values, interval[0], out=out)
+    return numpy.divide(result, interval[1] - interval[0], out=out)
 
 
 def scale_to_custom_interval(
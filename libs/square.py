@@ -1,7 +1,10 @@
 from typing import Tuple
+import math
 import matplotlib.pyplot as plt
 import numpy as np
 
+_RNG = np.random.default_rng()
+
 
 class Square:
     x_min: float = 0.0
@@ -16,7 +19,6 @@ class Square:
     ) -> "Square":
         self._resize(scale=scale)
         self._translate(translation=translation)
-        self._set_corners()
 
     def _resize(self, scale: float):
         """resize the square according to input scale"""
@@ -24,7 +26,6 @@ class Square:
         self.x_max *= scale
         self.y_min *= scale
         self.y_max *= scale
-        self._set_corners()
 
     def _translate(self, translation: Tuple[float, float]):
         """translate the square according to input scale"""
@@ -32,14 +33,6 @@ class Square:
         self.x_max += translation[0]
         self.y_min += translation[1]
         self.y_max += translation[1]
-        self._set_corners()
-
-    def _set_corners(self):
-        """set values for four points representing the corners of the square"""
-        self.p1 = np.array([self.x_min, self.y_min])  # bottom left
-        self.p2 = np.array([self.x_max, self.y_min])  # bottom right
-        self.p3 = np.array([self.x_max, self.y_max])  # top right
-        self.p4 = np.array([self.x_min, self.y_max])  # top left
 
     def draw_border(
         self,
@@ -50,7 +43,12 @@ class Square:
         color: str = "k",
     ):
         """Draw the borders of the square"""
-        points = np.stack([self.p1, self.p2, self.p3, self.p4, self.p1])
+        points = borders_batch(
+            x_mins=np.array([self.x_min]),
+            x_maxs=np.array([self.x_max]),
+            y_mins=np.array([self.y_min]),
+            y_maxs=np.array([self.y_max]),
+        )[0]
         axis.plot(
             points[:, 0],
             points[:, 1],
@@ -66,40 +64,90 @@ class Square:
         * the x-y of starting points are uniformly distributed
         * the ending points goes all the way to the border of boundary
         """
-        # Get random starting points for inside lines
-        starts_x = np.random.uniform(low=self.x_min, high=self.x_max, size=count)
-        starts_y = np.random.uniform(low=self.y_min, high=self.y_max, size=count)
-
-        # Calculate the length of each line until it hits a boundary
-        if np.cos(angle) >= 0:
-            border_x = self.x_max  # angle shooting to the right
-        else:
-            border_x = self.x_min  # angle shooting to the left
-        if np.sin(angle) >= 0:
-            border_y = self.y_max  # angle shooting up
-        else:
-            border_y = self.y_min  # angle shooting down
-        #  we don't have to worry about division by zero when cos(angle)
-        #  or sin(angle) are zero, because they can only shoot up to
-        #  +inf and we are interested in min values
-        lengths = np.stack(
-            [
-                np.abs((border_x - starts_x) / np.cos(angle)),
-                np.abs((border_y - starts_y) / np.sin(angle)),
-            ],
-            axis=1,
-        ).min(axis=1)
-
-        # Compute the ending point of each line
-        ends_x = starts_x + lengths * np.cos(angle)
-        ends_y = starts_y + lengths * np.sin(angle)
-
-        # in order to prevent plt from drawing a line in between
-        # two points, put a pair of [nan, nan] between them:
-        # [[p1x, p1y], [p2x, p2y], [nan, nan], [p3x, p3y],...]
-        nans = np.empty(count)
-        nans.fill(np.nan)
-        points = np.stack(
-            [starts_x, starts_y, ends_x, ends_y, nans, nans], axis=1
-        ).reshape((count * 3, 2))
-        return points
+        return inside_lines_batch(
+            x_mins=np.array([self.x_min]),
+            x_maxs=np.array([self.x_max]),
+            y_mins=np.array([self.y_min]),
+            y_maxs=np.array([self.y_max]),
+            counts=np.array([count]),
+            cos_angles=np.array([math.cos(angle)]),
+            sin_angles=np.array([math.sin(angle)]),
+        )
+
+
+def borders_batch(
+    x_mins: np.ndarray,
+    x_maxs: np.ndarray,
+    y_mins: np.ndarray,
+    y_maxs: np.ndarray,
+) -> np.ndarray:
+    """Return the closed outlines of many squares as a (N, 5, 2) array"""
+    return np.stack(
+        [
+            np.stack([x_mins, y_mins], axis=1),  # bottom left
+            np.stack([x_maxs, y_mins], axis=1),  # bottom right
+            np.stack([x_maxs, y_maxs], axis=1),  # top right
+            np.stack([x_mins, y_maxs], axis=1),  # top left
+            np.stack([x_mins, y_mins], axis=1),  # bottom left
+        ],
+        axis=1,
+    )
+
+
+def inside_lines_batch(
+    x_mins: np.ndarray,
+    x_maxs: np.ndarray,
+    y_mins: np.ndarray,
+    y_maxs: np.ndarray,
+    counts: np.ndarray,
+    cos_angles: np.ndarray,
+    sin_angles: np.ndarray,
+) -> np.ndarray:
+    """
+    Same as Square.inside_lines, for many squares at once
+    * the i-th square is [x_mins[i], x_maxs[i]] x [y_mins[i], y_maxs[i]]
+    * it gets counts[i] lines, all with the angle given by its cosine and
+      sine, cos_angles[i] and sin_angles[i]
+    * the lines of all squares are returned in one NaN-separated array
+    """
+    # Expand the per square values to per line values, in float32
+    cos_angles = np.repeat(np.asarray(cos_angles, dtype=np.float32), counts)
+    sin_angles = np.repeat(np.asarray(sin_angles, dtype=np.float32), counts)
+    x_mins = np.repeat(np.asarray(x_mins, dtype=np.float32), counts)
+    x_maxs = np.repeat(np.asarray(x_maxs, dtype=np.float32), counts)
+    y_mins = np.repeat(np.asarray(y_mins, dtype=np.float32), counts)
+    y_maxs = np.repeat(np.asarray(y_maxs, dtype=np.float32), counts)
+
+    # Get random starting points for inside lines, all from one draw of
+    # uniforms in [0, 1) mapped onto each square in place
+    starts_x, starts_y = _RNG.random(size=(2, counts.sum()), dtype=np.float32)
+    starts_x *= x_maxs - x_mins
+    starts_x += x_mins
+    starts_y *= y_maxs - y_mins
+    starts_y += y_mins
+
+    # Calculate the length of each line until it hits a boundary
+    border_x = np.where(cos_angles >= 0, x_maxs, x_mins)
+    border_y = np.where(sin_angles >= 0, y_maxs, y_mins)
+    #  we don't have to worry about division by zero when cos(angle)
+    #  or sin(angle) are zero, because they can only shoot up to
+    #  +inf and we are interested in min values; a start right on that
+    #  border gives 0/0, which fmin skips in favour of the other length
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lengths = np.abs((border_x - starts_x) / cos_angles)
+        np.fmin(lengths, np.abs((border_y - starts_y) / sin_angles), out=lengths)
+
+    # Compute the ending point of each line
+    ends_x = starts_x + lengths * cos_angles
+    ends_y = starts_y + lengths * sin_angles
+
+    # in order to prevent plt from drawing a line in between
+    # two points, put a pair of [nan, nan] between them:
+    # [[p1x, p1y], [p2x, p2y], [nan, nan], [p3x, p3y],...]
+    points = np.empty((counts.sum() * 3, 2), dtype=np.float32)
+    points[0::3, 0] = starts_x
+    points[0::3, 1] = starts_y
+    points[1::3, 0] = ends_x
+    points[1::3, 1] = ends_y
+    points[2::3] = np.nan
+    return points
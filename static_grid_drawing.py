@@ -1,39 +1,76 @@
 from typing import Tuple, Callable
+import math
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import numpy as np
 
-from libs.common import normalize_to_unit_interval, scale_to_custom_interval
-from libs.square import Square
+from libs.common import normalize_to_unit_interval
+from libs.square import Square, borders_batch, inside_lines_batch
 
 
 def _draw(
+    axis: plt.Axes,
     x_range: Tuple[int, int],
     y_range: Tuple[int, int],
     count_range: Tuple[int, int],
     distance_to_origin_range: Callable,
-    scale: Callable,
-    translation: Callable,
+    scale: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    translation: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]],
 ) -> None:
     distance_to_origin_range = distance_to_origin_range(x_range, y_range)
-    _, axis = plt.subplots(nrows=1, ncols=1, sharex=True, figsize=(10, 10))
-    points = list()
-    for x in range(*x_range):
-        for y in range(*y_range):
-            distance_to_origin = np.sqrt(x**2 + y**2)
-            count_normalized = normalize_to_unit_interval(
-                values=distance_to_origin, interval=distance_to_origin_range
-            )
-            count = int(
-                scale_to_custom_interval(values=count_normalized, interval=count_range)
-            )
-            angle = np.arctan2(y, x)
-            square = Square(scale=scale(x, y), translation=translation(x, y))
-            points += [
-                square.inside_lines(count, angle),
-                np.array([[np.nan, np.nan]]),
-            ]
-            square.draw_border(axis=axis)
-    points = np.concatenate(points)
+    # All the grid cells at once, flattened in the same x-major order as
+    # iterating over x and then over y.
+    xs, ys = np.meshgrid(np.arange(*x_range), np.arange(*y_range), indexing="ij")
+    xs = xs.flatten()
+    ys = ys.flatten()
+    distances_to_origin = np.hypot(xs, ys)
+    # The lines only need the cosine and sine of the cell angle atan2(y, x),
+    # which are the coordinates over the distance; atan2 gives 0 at the origin.
+    cos_angles = np.divide(
+        xs, distances_to_origin, out=np.ones(xs.shape), where=distances_to_origin > 0
+    )
+    sin_angles = np.divide(
+        ys, distances_to_origin, out=np.zeros(ys.shape), where=distances_to_origin > 0
+    )
+    # affine map of distances to count_range, same op order as before
+    counts_normalized = normalize_to_unit_interval(
+        values=distances_to_origin,
+        interval=distance_to_origin_range,
+        out=distances_to_origin,
+    )
+    counts = (
+        counts_normalized * (count_range[1] - count_range[0]) + count_range[0]
+    ).astype(int)
+    # scale and translation take the arrays of all cells at once; broadcast the
+    # results so that constants, e.g. `lambda x, y: 1`, work as well.
+    scales = np.broadcast_to(scale(xs, ys), xs.shape)
+    translations_x, translations_y = (
+        np.broadcast_to(t, xs.shape) for t in translation(xs, ys)
+    )
+    # Bounds of the squares, as Square would resize and then translate them,
+    # without allocating a Square per cell.
+    x_mins = Square.x_min * scales + translations_x
+    x_maxs = Square.x_max * scales + translations_x
+    y_mins = Square.y_min * scales + translations_y
+    y_maxs = Square.y_max * scales + translations_y
+    points = inside_lines_batch(
+        x_mins=x_mins,
+        x_maxs=x_maxs,
+        y_mins=y_mins,
+        y_maxs=y_maxs,
+        counts=counts,
+        cos_angles=cos_angles,
+        sin_angles=sin_angles,
+    )
+    # One collection for all the borders instead of one Line2D artist per square
+    axis.add_collection(
+        LineCollection(
+            borders_batch(x_mins=x_mins, x_maxs=x_maxs, y_mins=y_mins, y_maxs=y_maxs),
+            linewidths=1.0,
+            linestyles="solid",
+            colors="k",
+        )
+    )
     axis.plot(
         points[:, 0],
         points[:, 1],
@@ -42,69 +79,80 @@ def _draw(
         marker="",
         color="k",
     )
-    plt.axis("equal")
-    plt.axis("off")
-    plt.tight_layout()
-    plt.show()
+    axis.axis("equal")
+    axis.axis("off")
 
 
 def _get_distance_to_origin_range(
     x_range: Tuple[int, int], y_range: Tuple[int, int]
 ) -> Tuple[int, int]:
     return (
-        np.sqrt(x_range[0] ** 2 + y_range[0] ** 2),
-        np.sqrt(x_range[1] ** 2 + y_range[1] ** 2),
+        math.hypot(x_range[0], y_range[0]),
+        math.hypot(x_range[1], y_range[1]),
     )
 
 
-#  # example 1
-_draw(
-    x_range=(0, 20),
-    y_range=(0, 20),
-    count_range=(0, 150),
-    distance_to_origin_range=_get_distance_to_origin_range,
-    scale=lambda x, y: 1,
-    translation=lambda x, y: (x, y),
-)
-
-
-#  # examples 2
-_draw(
-    x_range=(0, 5),
-    y_range=(0, 5),
-    count_range=(0, 150),
-    distance_to_origin_range=_get_distance_to_origin_range,
-    scale=lambda x, y: 1 / (np.sqrt(x**2 + y**2) + 0.2),
-    translation=lambda x, y: (x, y),
-)
-
-
-#  # examples 3 -- this was the one that did not draw grid
-_draw(
-    x_range=(0, 10),
-    y_range=(0, 10),
-    count_range=(0, 100),
-    distance_to_origin_range=_get_distance_to_origin_range,
-    scale=lambda x, y: 1,
-    translation=lambda x, y: (x, y),
-)
-
-
-#  # examples 4
-def _get_distance_to_origin_range(
+def _get_distance_to_origin_range_around_origin(
     x_range: Tuple[int, int], y_range: Tuple[int, int]
 ) -> Tuple[int, int]:
+    # for grids spanning both sides of the origin, e.g. example 4
     return (
         0,
-        np.sqrt(np.abs(x_range).max() ** 2 + np.abs(y_range).max() ** 2),
+        math.hypot(max(abs(v) for v in x_range), max(abs(v) for v in y_range)),
+    )
+
+
+def main():
+    # All the examples share one figure, one panel each
+    figure, axes = plt.subplots(nrows=2, ncols=2, figsize=(20, 20))
+
+    #  # example 1
+    _draw(
+        axis=axes[0, 0],
+        x_range=(0, 20),
+        y_range=(0, 20),
+        count_range=(0, 150),
+        distance_to_origin_range=_get_distance_to_origin_range,
+        scale=lambda x, y: 1,
+        translation=lambda x, y: (x, y),
+    )
+
+    #  # examples 2
+    _draw(
+        axis=axes[0, 1],
+        x_range=(0, 5),
+        y_range=(0, 5),
+        count_range=(0, 150),
+        distance_to_origin_range=_get_distance_to_origin_range,
+        scale=lambda x, y: 1 / (np.hypot(x, y) + 0.2),
+        translation=lambda x, y: (x, y),
+    )
+
+    #  # examples 3 -- this was the one that did not draw grid
+    _draw(
+        axis=axes[1, 0],
+        x_range=(0, 10),
+        y_range=(0, 10),
+        count_range=(0, 100),
+        distance_to_origin_range=_get_distance_to_origin_range,
+        scale=lambda x, y: 1,
+        translation=lambda x, y: (x, y),
+    )
+
+    #  # examples 4
+    _draw(
+        axis=axes[1, 1],
+        x_range=(-9, 10),
+        y_range=(-9, 10),
+        count_range=(0, 150),
+        distance_to_origin_range=_get_distance_to_origin_range_around_origin,
+        scale=lambda x, y: 1,
+        translation=lambda x, y: (x, y),
     )
 
+    figure.tight_layout()
+    plt.show()
+
 
-_draw(
-    x_range=(-9, 10),
-    y_range=(-9, 10),
-    count_range=(0, 150),
-    distance_to_origin_range=_get_distance_to_origin_range,
-    scale=lambda x, y: 1,
-    translation=lambda x, y: (x, y),
-)
+if __name__ == "__main__":
+    main()